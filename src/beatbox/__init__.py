@@ -1,2 +1,2 @@
-from beatbox_recorder.core import Beatbox, Mode, BeatboxError, NoRecordingError, SerializationError
-__all__ = ["Beatbox", "Mode", "BeatboxError", "NoRecordingError", "SerializationError"]
+from beatbox_recorder.core import Beatbox, Mode, StorageFormat, BeatboxError, NoRecordingError, SerializationError
+__all__ = ["Beatbox", "Mode", "StorageFormat", "BeatboxError", "NoRecordingError", "SerializationError"]
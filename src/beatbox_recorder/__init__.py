@@ -1,2 +1,2 @@
-from .core import Beatbox, Mode, BeatboxError, NoRecordingError, SerializationError
-__all__ = ["Beatbox", "Mode", "BeatboxError", "NoRecordingError", "SerializationError"]
+from .core import Beatbox, Mode, StorageFormat, BeatboxError, NoRecordingError, SerializationError
+__all__ = ["Beatbox", "Mode", "StorageFormat", "BeatboxError", "NoRecordingError", "SerializationError"]
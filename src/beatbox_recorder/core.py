@@ -1,10 +1,11 @@
 from enum import Enum
 import json
+import pickle
 import hashlib
 import asyncio
 import os
 import inspect
-from typing import Any, Callable, Dict, TypeVar, Set
+from typing import Any, Callable, Dict, Optional, TypeVar, Set
 from datetime import datetime
 from functools import wraps
 
@@ -15,6 +16,10 @@ class Mode(str, Enum):
     RECORD = "RECORD"
     PLAYBACK = "PLAYBACK"
 
+class StorageFormat(str, Enum):
+    PICKLE = "PICKLE"
+    JSON = "JSON"
+
 class BeatboxError(Exception):
     pass
 
@@ -25,8 +30,16 @@ class SerializationError(BeatboxError):
     pass
 
 class Beatbox:
-    def __init__(self, storage_file: str = "beatbox_storage.json"):
+    def __init__(self, storage_file: str = "beatbox_storage.pkl", storage_format: Optional[str] = None):
         self.storage_file = storage_file
+        if storage_format is None:
+            # Infer the format from the file extension, defaulting to pickle
+            is_json = os.path.splitext(storage_file)[1].lower() == ".json"
+            storage_format = StorageFormat.JSON if is_json else StorageFormat.PICKLE
+        try:
+            self.storage_format = StorageFormat(storage_format)
+        except ValueError:
+            raise BeatboxError(f"Invalid storage format: {storage_format}")
         self.storage: Dict[str, Any] = {}
         self.mode = Mode.BYPASS
         self._load_storage()
@@ -38,23 +51,43 @@ class Beatbox:
         except ValueError:
             raise BeatboxError(f"Invalid mode: {mode}")
             
+    def clear(self) -> None:
+        """Discard all recordings, in memory and on disk."""
+        self.storage = {}
+        self._save_storage()
+            
     def _load_storage(self) -> None:
         """Load saved recordings."""
         if os.path.exists(self.storage_file):
             try:
-                with open(self.storage_file, 'r') as f:
-                    self.storage = json.load(f)
-            except json.JSONDecodeError:
+                self.storage = self._read_storage()
+            except ValueError:
                 # Backup corrupted file
                 backup = f"{self.storage_file}.backup.{int(datetime.now().timestamp())}"
                 os.rename(self.storage_file, backup)
                 print(f"Storage file was corrupted. Backed up to {backup} and created new storage.")
                 self.storage = {}
                 
+    def _read_storage(self) -> Dict[str, Any]:
+        """Read recordings from the storage file."""
+        if self.storage_format == StorageFormat.PICKLE:
+            try:
+                with open(self.storage_file, 'rb') as f:
+                    return pickle.load(f)
+            except Exception:
+                # May be a JSON file written before pickle became the default
+                pass
+        with open(self.storage_file, 'r') as f:
+            return json.load(f)
+                
     def _save_storage(self) -> None:
         """Save recordings to disk."""
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.storage, f, indent=2)
+        if self.storage_format == StorageFormat.JSON:
+            with open(self.storage_file, 'w') as f:
+                json.dump(self.storage, f, indent=2)
+        else:
+            with open(self.storage_file, 'wb') as f:
+                pickle.dump(self.storage, f, protocol=pickle.HIGHEST_PROTOCOL)
             
     def _make_key(self, func: Callable, args: tuple, kwargs: dict) -> str:
         """Create a unique key for the function call."""
@@ -78,20 +111,38 @@ class Beatbox:
             
         return hashlib.md5(str(call_repr).encode()).hexdigest()
 
-    def _serialize(self, obj: Any, memo: Set = None) -> Any:
+    def _encode(self, obj: Any) -> Any:
+        """Convert a result to its stored form."""
+        if self.storage_format == StorageFormat.PICKLE:
+            try:
+                return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # Not picklable (e.g. local classes), fall back to the portable format
+                pass
+        return self._serialize(obj)
+
+    def _decode(self, obj: Any) -> Any:
+        """Convert a stored result back to a Python object."""
+        if isinstance(obj, bytes):
+            return pickle.loads(obj)
+        return self._deserialize(obj)
+
+    def _serialize(self, obj: Any, memo: Optional[Set[int]] = None) -> Any:
         """Convert Python objects to JSON-serializable format."""
+        # Primitives cannot contain references, so skip cycle tracking for them
+        if isinstance(obj, (str, int, float, bool, type(None))):
+            return obj
+
         if memo is None:
             memo = set()
             
-        # Handle circular references
+        # Handle circular references; memo holds the ids of the current ancestors
         obj_id = id(obj)
         if obj_id in memo:
             return "[Circular Reference]"
         memo.add(obj_id)
         
         try:
-            if isinstance(obj, (str, int, float, bool, type(None))):
-                return obj
             if isinstance(obj, (list, tuple)):
                 return {
                     "__type": "tuple" if isinstance(obj, tuple) else "list",
@@ -196,7 +247,7 @@ class Beatbox:
                 if self.mode == Mode.RECORD:
                     result = await func(*args, **kwargs)
                     try:
-                        self.storage[key] = self._serialize(result)
+                        self.storage[key] = self._encode(result)
                         self._save_storage()
                     except Exception as e:
                         print(f"Warning: Failed to record result: {e}")
@@ -205,7 +256,7 @@ class Beatbox:
                 # PLAYBACK mode
                 if key not in self.storage:
                     raise NoRecordingError(f"No recorded result found for arguments: {json.dumps((args, kwargs))}")
-                return self._deserialize(self.storage[key])
+                return self._decode(self.storage[key])
                 
             return async_wrapper
             
@@ -223,7 +274,7 @@ class Beatbox:
                 if self.mode == Mode.RECORD:
                     result = func(*args, **kwargs)
                     try:
-                        self.storage[key] = self._serialize(result)
+                        self.storage[key] = self._encode(result)
                         self._save_storage()
                     except Exception as e:
                         print(f"Warning: Failed to record result: {e}")
@@ -232,6 +283,6 @@ class Beatbox:
                 # PLAYBACK mode
                 if key not in self.storage:
                     raise NoRecordingError(f"No recorded result found for arguments: {json.dumps((args, kwargs))}")
-                return self._deserialize(self.storage[key])
+                return self._decode(self.storage[key])
                 
             return sync_wrapper
\ No newline at end of file
@@ -1,28 +1,219 @@
 import pytest
 import asyncio
-import os
+import importlib
 from datetime import datetime
-from beatbox_recorder import Beatbox, Mode, NoRecordingError, BeatboxError
+import beatbox_recorder
+from beatbox_recorder import Beatbox, Mode, StorageFormat, NoRecordingError, BeatboxError
 
-TEST_STORAGE_FILE = "test_storage.json"
+TEST_STORAGE_FILE = "test_storage.pkl"
 
-@pytest.fixture
-async def beatbox():
-    bb = Beatbox(TEST_STORAGE_FILE)
-    yield bb
-    # Cleanup
-    try:
-        os.remove(TEST_STORAGE_FILE)
-    except FileNotFoundError:
-        pass
+@pytest.fixture(scope="session")
+def beatbox(tmp_path_factory):
+    storage_file = tmp_path_factory.mktemp("beatbox") / TEST_STORAGE_FILE
+    bb = Beatbox(str(storage_file))
+    return bb
+
+@pytest.fixture(autouse=True)
+def _reset_beatbox(beatbox):
+    yield
+    beatbox.clear()
+    beatbox.set_mode(Mode.BYPASS)
 
 # All existing test functions remain the same...
 
-@pytest.mark.asyncio
+class _Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return isinstance(other, _Point) and (self.x, self.y) == (other.x, other.y)
+
+class _MethodTarget:
+    def method1(self, x):
+        return x + 1
+
+    def method2(self, x):
+        return x + 2
+
+class _InstanceTarget:
+    def __init__(self, id):
+        self.id = id
+
+    def method(self, x):
+        return x + self.id
+
+async def async_add(a: int, b: int) -> int:
+    await asyncio.sleep(0)
+    return a + b
+
+async def async_error() -> None:
+    await asyncio.sleep(0)
+    raise ValueError("Async error")
+
 class TestBeatbox:
     # All existing test methods remain...
 
-    async def test_identical_signature_functions(self, beatbox):
+    def test_legacy_import_path(self):
+        """Test that the beatbox package re-exports the beatbox_recorder API."""
+        legacy = importlib.import_module("beatbox")
+        assert legacy.__all__ == beatbox_recorder.__all__
+        for name in beatbox_recorder.__all__:
+            assert getattr(legacy, name) is getattr(beatbox_recorder, name)
+
+    async def test_async_bypass(self, beatbox):
+        """Test that async functions run normally in bypass mode."""
+        wrapped = beatbox.wrap(async_add)
+        assert await wrapped(2, 3) == 5
+
+    async def test_async_record_playback(self, beatbox):
+        """Test that async results are recorded and played back."""
+        wrapped = beatbox.wrap(async_add)
+
+        beatbox.set_mode(Mode.RECORD)
+        assert await wrapped(2, 3) == 5
+
+        beatbox.set_mode(Mode.PLAYBACK)
+        assert await wrapped(2, 3) == 5
+        with pytest.raises(NoRecordingError):
+            await wrapped(3, 4)
+
+        # The recording is on disk as soon as the call returns
+        reloaded = Beatbox(beatbox.storage_file)
+        reloaded.set_mode(Mode.PLAYBACK)
+        assert await reloaded.wrap(async_add)(2, 3) == 5
+
+    async def test_async_error_handling(self, beatbox):
+        """Test that errors raised by async functions propagate."""
+        wrapped = beatbox.wrap(async_error)
+
+        beatbox.set_mode(Mode.RECORD)
+        with pytest.raises(ValueError, match="Async error"):
+            await wrapped()
+
+    @pytest.mark.parametrize("func,args,expected", [
+        (lambda x: x is None, (None,), True),
+        (lambda obj: {**obj, "seen": True}, ({"id": 1, "tags": ["a", "b"]},), {"id": 1, "tags": ["a", "b"], "seen": True}),
+        (lambda items: [x * 2 for x in items], ([1, 2, 3],), [2, 4, 6]),
+    ], ids=["undefined", "object", "array"])
+    def test_argument_types(self, beatbox, func, args, expected):
+        """Test recording and playback with None, dict and list arguments."""
+        wrapped = beatbox.wrap(func)
+
+        beatbox.set_mode(Mode.RECORD)
+        assert wrapped(*args) == expected
+
+        beatbox.set_mode(Mode.PLAYBACK)
+        assert wrapped(*args) == expected
+
+    def test_special_types(self, beatbox):
+        """Test that pickle storage preserves Python types exactly."""
+        def get_special_types():
+            return {
+                "set": {1, 2, 3},
+                "datetime": datetime(2024, 1, 1, 12, 0),
+                "tuple": (1, "two", 3.0),
+                "range": range(0, 10, 2),
+                "object": _Point(1, 2),
+            }
+
+        wrapped = beatbox.wrap(get_special_types)
+
+        beatbox.set_mode(Mode.RECORD)
+        expected = wrapped()
+
+        beatbox.set_mode(Mode.PLAYBACK)
+        assert wrapped() == expected
+
+        # Recordings survive a reload from disk
+        reloaded = Beatbox(beatbox.storage_file)
+        reloaded.set_mode(Mode.PLAYBACK)
+        assert reloaded.wrap(get_special_types)() == expected
+
+    def test_json_storage_format(self, tmp_path):
+        """Test that JSON storage is used for .json files."""
+        def get_data():
+            return {"tags": {"a", "b"}, "when": datetime(2024, 1, 1)}
+
+        storage_file = str(tmp_path / "storage.json")
+        bb = Beatbox(storage_file)
+        assert bb.storage_format == StorageFormat.JSON
+
+        bb.set_mode(Mode.RECORD)
+        expected = bb.wrap(get_data)()
+
+        reloaded = Beatbox(storage_file)
+        reloaded.set_mode(Mode.PLAYBACK)
+        assert reloaded.wrap(get_data)() == expected
+
+    @pytest.mark.parametrize("content", [
+        b"\x80\x05garbage",
+        b"\x80\x09.",
+        b"I12x\n.",
+        b"cnosuchmod\nX\n.",
+        b"",
+    ], ids=["truncated", "bad-protocol", "bad-int", "missing-module", "empty"])
+    def test_corrupted_storage(self, tmp_path, content):
+        """Test that a corrupted storage file is backed up and replaced."""
+        storage_file = tmp_path / TEST_STORAGE_FILE
+        storage_file.write_bytes(content)
+
+        bb = Beatbox(str(storage_file))
+        assert bb.storage == {}
+        assert not storage_file.exists()
+        assert len(list(tmp_path.glob(f"{TEST_STORAGE_FILE}.backup.*"))) == 1
+
+    def test_legacy_json_storage(self, tmp_path):
+        """Test that JSON recordings under a non-.json name are still loaded."""
+        def get_data():
+            return {"tags": {"a", "b"}}
+
+        json_file = tmp_path / "storage.json"
+        bb = Beatbox(str(json_file))
+        bb.set_mode(Mode.RECORD)
+        expected = bb.wrap(get_data)()
+
+        storage_file = tmp_path / "storage.dat"
+        json_file.rename(storage_file)
+        reloaded = Beatbox(str(storage_file))
+        assert reloaded.storage_format == StorageFormat.PICKLE
+        reloaded.set_mode(Mode.PLAYBACK)
+        assert reloaded.wrap(get_data)() == expected
+
+    def test_invalid_storage_format(self, tmp_path):
+        """Test that an unknown storage format is rejected."""
+        with pytest.raises(BeatboxError):
+            Beatbox(str(tmp_path / TEST_STORAGE_FILE), storage_format="XML")
+
+    def test_non_serializable_results(self, beatbox, tmp_path):
+        """Test that circular references are handled by both storage formats."""
+        def get_circular():
+            obj = {"name": "circular", "shared": [1, 2]}
+            obj["self"] = obj
+            obj["again"] = obj["shared"]
+            return obj
+
+        # Pickle storage keeps the cycle intact
+        wrapped = beatbox.wrap(get_circular)
+        beatbox.set_mode(Mode.RECORD)
+        wrapped()
+        beatbox.set_mode(Mode.PLAYBACK)
+        result = wrapped()
+        assert result["self"] is result
+
+        # JSON storage replaces the cycle with a placeholder
+        bb = Beatbox(str(tmp_path / "storage.json"))
+        wrapped = bb.wrap(get_circular)
+        bb.set_mode(Mode.RECORD)
+        wrapped()
+        bb.set_mode(Mode.PLAYBACK)
+        result = wrapped()
+        assert result["name"] == "circular"
+        assert result["self"] == "[Circular Reference]"
+        # Repeated but non-circular references are kept
+        assert result["again"] == [1, 2]
+
+    def test_identical_signature_functions(self, beatbox):
         """Test that functions with identical signatures but different names are stored separately."""
         def func1(x: int) -> int:
             return x + 1
@@ -39,14 +230,39 @@ class TestBeatbox:
         result2 = wrapped2(5)
         assert result1 == 6
         assert result2 == 7
-        await asyncio.sleep(0.1)  # Allow async save
 
         # Playback - ensure they return different results
         beatbox.set_mode(Mode.PLAYBACK)
         assert wrapped1(5) == 6
         assert wrapped2(5) == 7
 
-    async def test_lambda_functions(self, beatbox):
+    def test_multiple_storage_instances(self, tmp_path):
+        """Test that separate storage files keep their recordings apart."""
+        def add(x: int) -> int:
+            return x + 1
+
+        bb1 = Beatbox(str(tmp_path / "storage1.json"))
+        bb2 = Beatbox(str(tmp_path / "storage2.json"))
+        wrapped1 = bb1.wrap(add)
+        wrapped2 = bb2.wrap(add)
+
+        # Record only in the first instance
+        bb1.set_mode(Mode.RECORD)
+        assert wrapped1(5) == 6
+
+        # Playback - only the first instance has the recording
+        bb1.set_mode(Mode.PLAYBACK)
+        bb2.set_mode(Mode.PLAYBACK)
+        assert wrapped1(5) == 6
+        with pytest.raises(NoRecordingError):
+            wrapped2(5)
+
+        # A new instance on the same file sees the recording
+        bb3 = Beatbox(str(tmp_path / "storage1.json"))
+        bb3.set_mode(Mode.PLAYBACK)
+        assert bb3.wrap(add)(5) == 6
+
+    def test_lambda_functions(self, beatbox):
         """Test that lambda functions are handled by their arguments only."""
         lambda1 = lambda x: x + 1
         lambda2 = lambda x: x + 2  # Different lambda, same signature
@@ -60,7 +276,6 @@ class TestBeatbox:
         result2 = wrapped2(6)
         assert result1 == 6
         assert result2 == 8
-        await asyncio.sleep(0.1)
 
         # Playback - verify they share cache based on arguments
         beatbox.set_mode(Mode.PLAYBACK)
@@ -70,16 +285,9 @@ class TestBeatbox:
         # Verify that using the same args returns the first recorded result
         assert wrapped2(5) == 6  # Same args as first call
 
-    async def test_method_functions(self, beatbox):
+    def test_method_functions(self, beatbox):
         """Test that class methods are handled correctly."""
-        class TestClass:
-            def method1(self, x):
-                return x + 1
-
-            def method2(self, x):
-                return x + 2
-
-        obj = TestClass()
+        obj = _MethodTarget()
         
         beatbox.set_mode(Mode.RECORD)
         wrapped1 = beatbox.wrap(obj.method1)
@@ -90,24 +298,16 @@ class TestBeatbox:
         result2 = wrapped2(5)
         assert result1 == 6
         assert result2 == 7
-        await asyncio.sleep(0.1)
 
         # Playback - ensure they return different results
         beatbox.set_mode(Mode.PLAYBACK)
         assert wrapped1(5) == 6
         assert wrapped2(5) == 7
 
-    async def test_instance_method_consistency(self, beatbox):
+    def test_instance_method_consistency(self, beatbox):
         """Test that instance methods with the same name but different args cache separately."""
-        class TestClass:
-            def __init__(self, id):
-                self.id = id
-
-            def method(self, x):
-                return x + self.id
-
-        obj1 = TestClass(1)
-        obj2 = TestClass(2)
+        obj1 = _InstanceTarget(1)
+        obj2 = _InstanceTarget(2)
 
         beatbox.set_mode(Mode.RECORD)
         wrapped1 = beatbox.wrap(obj1.method)
@@ -118,14 +318,13 @@ class TestBeatbox:
         result2 = wrapped2(2)  # Total: 4
         assert result1 == 2
         assert result2 == 4
-        await asyncio.sleep(0.1)
 
         # Playback - verify cache is based on method name + args
         beatbox.set_mode(Mode.PLAYBACK)
         assert wrapped1(1) == 2  # Same args as first call
         assert wrapped2(2) == 4  # Same args as second call
 
-    async def test_nested_function_wrapping(self, beatbox):
+    def test_nested_function_wrapping(self, beatbox):
         """Test that nested functions with the same name cache based on arguments."""
         def create_function(increment):
             def inner(x):
@@ -144,7 +343,6 @@ class TestBeatbox:
         result2 = wrapped2(2)  # Total: 4
         assert result1 == 2
         assert result2 == 4
-        await asyncio.sleep(0.1)
 
         # Playback - verify cache is based on function name + args
         beatbox.set_mode(Mode.PLAYBACK)